@@ -327,21 +327,16 @@ if __name__ == "__main__":
         num_dx, num_dy, num_dyaw = combi
         env_config = EnvConfig(
             dynamics_model=args.dynamics_model,
-            steer_actions=torch.round(
-                torch.linspace(-0.3, 0.3, 7), decimals=3
-            ),
-            accel_actions=torch.round(
-                torch.linspace(-6.0, 6.0, 7), decimals=3
-            ),
-            dx=torch.round(
-                torch.linspace(-3.0, 3.0, num_dx), decimals=3
-            ),
-            dy=torch.round(
-                torch.linspace(-3.0, 3.0, num_dy), decimals=3
-            ),
-            dyaw=torch.round(
-                torch.linspace(-1.0, 1.0, num_dyaw), decimals=3
-            ),
+            steer_actions_n=7,
+            steer_range=(-0.3, 0.3),
+            accel_actions_n=7,
+            accel_range=(-6.0, 6.0),
+            dx_n=num_dx,
+            dx_range=(-3.0, 3.0),
+            dy_n=num_dy,
+            dy_range=(-3.0, 3.0),
+            dyaw_n=num_dyaw,
+            dyaw_range=(-1.0, 1.0),
         )
 
         env = GPUDriveTorchEnv(
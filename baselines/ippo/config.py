@@ -1,5 +1,5 @@
-from networks.perm_eq_late_fusion import LateFusionNet, LateFusionPolicy
 from dataclasses import dataclass
+from functools import cached_property
 from pygpudrive.env.config import SelectionDiscipline
 @dataclass
 class ExperimentConfig:
@@ -56,8 +56,6 @@ class ExperimentConfig:
     n_epochs: int = 5
 
     # NETWORK
-    mlp_class = LateFusionNet
-    policy = LateFusionPolicy
     ego_state_layers = [64, 32]
     road_object_layers = [64, 64]
     road_graph_layers = [64, 64]
@@ -66,3 +64,17 @@ class ExperimentConfig:
     dropout = 0.0
     last_layer_dim_pi = 64
     last_layer_dim_vf = 64
+
+    # Network classes are imported lazily, so that reading the config does
+    # not pull in the network stack (stable-baselines3, wandb, ...)
+    @cached_property
+    def mlp_class(self):
+        from networks.perm_eq_late_fusion import LateFusionNet
+
+        return LateFusionNet
+
+    @cached_property
+    def policy(self):
+        from networks.perm_eq_late_fusion import LateFusionPolicy
+
+        return LateFusionPolicy
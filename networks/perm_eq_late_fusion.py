@@ -13,7 +13,6 @@ import wandb
 # Import env wrapper that makes gym env compatible with stable-baselines3
 from pygpudrive.env.wrappers.sb3_wrapper import SB3MultiAgentEnv
 from pygpudrive.env.config import EnvConfig
-from pygpudrive.env import constants
 
 
 class LateFusionNet(nn.Module):
@@ -31,9 +30,9 @@ class LateFusionNet(nn.Module):
         self.net_config = exp_config
 
         # Unpack feature dimensions
-        self.ego_input_dim = constants.EGO_FEAT_DIM if self.config.ego_state else 0
-        self.ro_input_dim = constants.PARTNER_FEAT_DIM if self.config.partner_obs else 0
-        self.rg_input_dim = constants.ROAD_GRAPH_FEAT_DIM if self.config.road_map_obs else 0
+        self.ego_input_dim = self.config.ego_state_dim
+        self.ro_input_dim = self.config.partner_obs_dim
+        self.rg_input_dim = self.config.road_map_obs_dim
 
         self.ro_max = self.config.max_num_agents_in_scene-1
         self.rg_max = self.config.roadgraph_top_k
@@ -1,14 +1,42 @@
 """Configuration classes and enums for GPUDrive Environments."""
 
+import os
 from dataclasses import dataclass
 from enum import Enum
+from functools import cached_property, lru_cache
 from typing import Tuple, Optional
 import torch
 
 import gpudrive
 from pygpudrive.env import constants
 
-@dataclass
+@lru_cache(maxsize=None)
+def _action_grid(low: float, high: float, num: int) -> torch.Tensor:
+    """Return a discrete action grid, shared by all configs that use it."""
+    return torch.round(torch.linspace(low, high, num), decimals=3)
+
+
+@lru_cache(maxsize=32)
+def _action_tensors_on(config, device):
+    """Return device-resident copies of the steer and accel action grids.
+
+    Keyed by the (hashable) config, so equal configs share a single copy per
+    device.
+    """
+    return config.steer_actions.to(device), config.accel_actions.to(device)
+
+
+@lru_cache(maxsize=32)
+def _delta_action_tensors_on(config, device):
+    """Return device-resident copies of the dx, dy and dyaw action grids."""
+    return (
+        config.dx.to(device),
+        config.dy.to(device),
+        config.dyaw.to(device),
+    )
+
+
+@dataclass(frozen=True)
 class EnvConfig:
     """Configuration settings for the GPUDrive gym environment.
 
@@ -20,6 +48,16 @@ class EnvConfig:
     2. Locate and modify the desired constant definitions (e.g., `kMaxAgentCount`).
     3. Save the changes to `src/consts.hpp`.
     4. Recompile the simulator to apply changes across both C++ and Python environments.
+
+    The config is frozen and hashable, so it can be used as a cache key for
+    state derived from it. The discrete action grids are therefore described
+    by their size and range, and the tensors are built on first access.
+
+    The action grid tensors (`steer_actions`, `accel_actions`, `dx`, `dy`,
+    `dyaw`) and their device copies from `get_action_tensors` and
+    `get_delta_action_tensors` are shared by every equal config, and by every
+    env built from one. They must not be modified in place; clone them first
+    if a modified grid is needed.
     """
 
     # Python-specific configurations
@@ -35,11 +73,16 @@ class EnvConfig:
     obs_radius: float = 100.0  # Radius for road observations
     polyline_reduction_threshold: float = 1.0  # Threshold for polyline reduction
     # Action space settings (joint discrete)
-    steer_actions: torch.Tensor = torch.round(torch.linspace(-1.0, 1.0, 13), decimals=3)
-    accel_actions: torch.Tensor = torch.round(torch.linspace(-4.0, 4.0, 7), decimals=3)
-    dx: torch.Tensor = torch.round(torch.linspace(-2.0, 2.0, 20), decimals=3)
-    dy: torch.Tensor = torch.round(torch.linspace(-2.0, 2.0, 20), decimals=3)
-    dyaw: torch.Tensor = torch.round(torch.linspace(-3.14, 3.14, 20), decimals=3)
+    steer_actions_n: int = 13  # Number of steering actions
+    steer_range: Tuple[float, float] = (-1.0, 1.0)  # Steering action range
+    accel_actions_n: int = 7  # Number of acceleration actions
+    accel_range: Tuple[float, float] = (-4.0, 4.0)  # Acceleration action range
+    dx_n: int = 20  # Number of dx actions (delta_local model)
+    dx_range: Tuple[float, float] = (-2.0, 2.0)  # dx action range
+    dy_n: int = 20  # Number of dy actions (delta_local model)
+    dy_range: Tuple[float, float] = (-2.0, 2.0)  # dy action range
+    dyaw_n: int = 20  # Number of dyaw actions (delta_local model)
+    dyaw_range: Tuple[float, float] = (-3.14, 3.14)  # dyaw action range
     dynamics_model: str = "classic" # Options: "classic", "bicycle", "delta_local"
     # Collision behavior settings
     collision_behavior: str = "remove"  # Options: "remove", "stop", "ignore"
@@ -57,6 +100,54 @@ class EnvConfig:
     roadgraph_top_k: int = gpudrive.kMaxAgentMapObservationsCount  # Top-K road graph segments agents can view
     episode_len: int = gpudrive.episodeLen  # Length of an episode in the simulator
 
+    @cached_property
+    def steer_actions(self) -> torch.Tensor:
+        """Discrete steering actions."""
+        return _action_grid(*self.steer_range, self.steer_actions_n)
+
+    @cached_property
+    def accel_actions(self) -> torch.Tensor:
+        """Discrete acceleration actions."""
+        return _action_grid(*self.accel_range, self.accel_actions_n)
+
+    @cached_property
+    def dx(self) -> torch.Tensor:
+        """Discrete dx actions."""
+        return _action_grid(*self.dx_range, self.dx_n)
+
+    @cached_property
+    def dy(self) -> torch.Tensor:
+        """Discrete dy actions."""
+        return _action_grid(*self.dy_range, self.dy_n)
+
+    @cached_property
+    def dyaw(self) -> torch.Tensor:
+        """Discrete dyaw actions."""
+        return _action_grid(*self.dyaw_range, self.dyaw_n)
+
+    @cached_property
+    def ego_state_dim(self) -> int:
+        """Per-agent ego state feature size, 0 if ego state is disabled."""
+        return constants.EGO_FEAT_DIM if self.ego_state else 0
+
+    @cached_property
+    def partner_obs_dim(self) -> int:
+        """Per-partner feature size, 0 if partner observations are disabled."""
+        return constants.PARTNER_FEAT_DIM if self.partner_obs else 0
+
+    @cached_property
+    def road_map_obs_dim(self) -> int:
+        """Per-road-point feature size, 0 if road graph observations are disabled."""
+        return constants.ROAD_GRAPH_FEAT_DIM if self.road_map_obs else 0
+
+    def get_action_tensors(self, device):
+        """Returns the (steer, accel) action grids on `device`, cached per device."""
+        return _action_tensors_on(self, device)
+
+    def get_delta_action_tensors(self, device):
+        """Returns the (dx, dy, dyaw) action grids on `device`, cached per device."""
+        return _delta_action_tensors_on(self, device)
+
 class SelectionDiscipline(Enum):
     """Enum for selecting scenes discipline in dataset configuration."""
     FIRST_N = 0
@@ -70,16 +161,40 @@ class SelectionDiscipline(Enum):
 class SceneConfig:
     """Configuration for selecting scenes from a dataset.
 
+    Creating a config starts listing `path` on a background daemon thread
+    (except for the RANDOM_N and K_UNIQUE_N disciplines), so the directory is
+    read once per construction, `dataclasses.replace` included. The
+    constructor itself does not touch the filesystem.
+
     Attributes:
         path (str): Path to the dataset.
         num_scenes (int): Number of scenes to select.
         discipline (SelectionDiscipline): Method for selecting scenes.
         k_unique_scenes (Optional[int]): Number of unique scenes if using K_UNIQUE_N discipline.
+        verbose (bool): Whether to print the ratio of unique selected scenes.
     """
     path: str
     num_scenes: int
     discipline: SelectionDiscipline = SelectionDiscipline.PAD_N
     k_unique_scenes: Optional[int] = None
+    verbose: bool = True
+
+    def __post_init__(self):
+        # Start listing the dataset in the background, so that it is ready by
+        # the time the scenes are selected
+        from pygpudrive.env.scene_selector import prefetch_scene_listing
+
+        self._listing_future = prefetch_scene_listing(self)
+        # The prefetch thread only exists in this process, a forked child
+        # must not wait on the future
+        self._listing_pid = os.getpid()
+
+    def __getstate__(self):
+        # The pending listing is process-local and cannot be pickled
+        state = self.__dict__.copy()
+        state.pop("_listing_future", None)
+        state.pop("_listing_pid", None)
+        return state
 
 
 class RenderMode(Enum):
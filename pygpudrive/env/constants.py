@@ -1,4 +1,4 @@
-import numpy as np
+import math
 
 """Predefined constants for the environment."""
 
@@ -10,7 +10,7 @@ MIN_REL_GOAL_COORD = -1000
 MAX_REL_GOAL_COORD = 1000
 MIN_REL_AGENT_POS = -1000
 MAX_REL_AGENT_POS = 1000
-MAX_ORIENTATION_RAD = 2 * np.pi
+MAX_ORIENTATION_RAD = math.tau
 
 # Road graph constants
 MIN_RG_COORD = -1000
@@ -113,13 +113,17 @@ class GPUDriveTorchEnv(GPUDriveGymEnv):
     def _set_discrete_action_space(self) -> None:
         """Configure the discrete action space."""
         if self.action_features == 'delta_local':
-            self.dx = self.config.dx.to(self.device)
-            self.dy = self.config.dy.to(self.device)
-            self.dyaw = self.config.dyaw.to(self.device)
+            (
+                self.dx,
+                self.dy,
+                self.dyaw,
+            ) = self.config.get_delta_action_tensors(self.device)
             products = product(self.dx, self.dy, self.dyaw)
         else:
-            self.steer_actions = self.config.steer_actions.to(self.device)
-            self.accel_actions = self.config.accel_actions.to(self.device)
+            (
+                self.steer_actions,
+                self.accel_actions,
+            ) = self.config.get_action_tensors(self.device)
             self.head_actions = torch.tensor([0], device=self.device)
             products = product(self.accel_actions, self.steer_actions, self.head_actions)
 
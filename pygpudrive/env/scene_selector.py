@@ -1,60 +1,213 @@
-import random
 import os
-import numpy as np
-from math import ceil
+import functools
+import hashlib
+import heapq
+import threading
+from concurrent.futures import Future, wait
+from itertools import islice, cycle
 from pygpudrive.env.config import SelectionDiscipline
 
 
+@functools.lru_cache(maxsize=16)
+def _list_tfrecords(path, mtime):
+    """Return the sorted traffic scene files in `path`.
 
-def select_scenes(config):
-    assert os.path.exists(config.path) and os.listdir(
-        config.path
-    ), "The data directory does not exist or is empty."
+    `mtime` is only used as part of the cache key, so that the listing is
+    refreshed whenever the directory contents change.
+    """
+    with os.scandir(path) as entries:
+        return tuple(
+            sorted(
+                entry.name
+                for entry in entries
+                if entry.name.startswith("tfrecord")
+            )
+        )
+
+
+def _is_non_empty_dir(path):
+    """Check that `path` is a directory with at least one entry."""
+    if not os.path.isdir(path):
+        return False
+    with os.scandir(path) as entries:
+        return next(entries, None) is not None
+
+
+_SCENE_RNG_SEED = 0x5CA1AB1E
+
+
+@functools.lru_cache(maxsize=16)
+def _reservoir_sample(path, mtime, k, seed=_SCENE_RNG_SEED):
+    """Uniformly sample `k` traffic scene files from `path` in a single pass.
+
+    Efraimidis-Spirakis reservoir sampling with unit weights: every scene is
+    given a random key and the `k` smallest keys are kept in a heap, so the
+    directory never has to be fully materialized or sorted. The keys are a
+    seeded hash of the file name rather than draws from a stateful RNG, which
+    keeps the sample reproducible regardless of the order `os.scandir`
+    yields entries in.
+    """
+    salt = seed.to_bytes(8, "little")
+
+    def key(name):
+        digest = hashlib.blake2b(
+            name.encode(), digest_size=8, salt=salt
+        ).digest()
+        return int.from_bytes(digest, "little")
 
-    all_scenes = sorted(os.listdir(config.path))
-    selected_scenes = None
-    if not any(scene.startswith("tfrecord") for scene in all_scenes):
+    with os.scandir(path) as entries:
+        reservoir = heapq.nsmallest(
+            k,
+            (
+                (key(entry.name), entry.name)
+                for entry in entries
+                if entry.name.startswith("tfrecord")
+            ),
+        )
+
+    if not reservoir:
         raise ValueError(
             "The data directory does not contain any traffic scenes. Maybe you specified a path to the wrong folder?"
         )
+    if len(reservoir) < k:
+        raise ValueError(
+            f"Cannot sample {k} scenes, the data directory only contains {len(reservoir)}."
+        )
 
-    def random_sample(k):
-        rand = random.Random(0x5CA1AB1E)
-        return rand.sample(all_scenes, k)
-
-    def repeat_to_N(scenes):
-        repeat_count = ceil(config.num_scenes / len(scenes))
-        return (scenes * repeat_count)[: config.num_scenes]
-
-    match config.discipline:
-        case SelectionDiscipline.FIRST_N:
-            selected_scenes = all_scenes[: config.num_scenes]
-            selected_scenes = all_scenes[: config.num_scenes]
-        case SelectionDiscipline.RANDOM_N:
-            selected_scenes = random_sample(all_scenes)
-        case SelectionDiscipline.PAD_N:
-            selected_scenes = repeat_to_N(all_scenes)
-        case SelectionDiscipline.EXACT_N:
-            assert len(all_scenes) == config.num_scenes
-            selected_scenes = all_scenes
-        case SelectionDiscipline.K_UNIQUE_N:
-            assert (
-                config.k_unique_scenes > 0 or config.k_unique_scenes is None
-            ), "K_UNIQUE_N discipline requires specifying positive value for K"
-            selected_scenes = repeat_to_N(
-                random_sample(config.k_unique_scenes)
-            )
+    return tuple(name for _, name in reservoir)
+
+
+def _run_prefetch(future, path):
+    """Fill `future` with the scene listing of `path`, unless it was cancelled."""
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        if os.path.isdir(path):
+            listing = _list_tfrecords(path, os.stat(path).st_mtime_ns)
+        else:
+            listing = None
+    except BaseException as exc:
+        future.set_exception(exc)
+    else:
+        future.set_result(listing)
+
+
+def prefetch_scene_listing(config):
+    """Start listing the scenes of `config.path` in a background thread.
+
+    The listing is stored in the `_list_tfrecords` cache, so a later
+    `select_scenes` call on the same unchanged directory does not have to
+    wait on the filesystem again. Each prefetch runs on its own daemon
+    thread, so prefetches of different directories do not queue behind each
+    other and interpreter exit does not wait for them.
+
+    Returns:
+        The future of the listing, or None if nothing needs to be prefetched.
+    """
+    if config.discipline in (
+        SelectionDiscipline.RANDOM_N,
+        SelectionDiscipline.K_UNIQUE_N,
+    ):
+        return None
+    future = Future()
+    threading.Thread(
+        target=_run_prefetch,
+        args=(future, config.path),
+        name="scene_prefetch",
+        daemon=True,
+    ).start()
+    return future
+
+
+def _all_scenes(config, mtime):
+    """Return the full sorted scene listing, which must not be empty."""
+    all_scenes = _list_tfrecords(config.path, mtime)
+    if not all_scenes:
+        raise ValueError(
+            "The data directory does not contain any traffic scenes. Maybe you specified a path to the wrong folder?"
+        )
+    return all_scenes
+
+
+def _repeat_to_n(scenes, n):
+    return list(islice(cycle(scenes), n))
+
+
+# Scene selection handlers, called as `handler(config, mtime, num_scenes)`.
+# The sampling disciplines stream over the directory instead of using the
+# full listing.
+def _first_n(config, mtime, num_scenes):
+    return _all_scenes(config, mtime)[:num_scenes]
+
+
+def _random_n(config, mtime, num_scenes):
+    return _reservoir_sample(config.path, mtime, num_scenes)
+
+
+def _pad_n(config, mtime, num_scenes):
+    return _repeat_to_n(_all_scenes(config, mtime), num_scenes)
+
+
+def _exact_n(config, mtime, num_scenes):
+    all_scenes = _all_scenes(config, mtime)
+    assert len(all_scenes) == num_scenes
+    return all_scenes
+
+
+def _k_unique_n(config, mtime, num_scenes):
+    assert (
+        config.k_unique_scenes > 0 or config.k_unique_scenes is None
+    ), "K_UNIQUE_N discipline requires specifying positive value for K"
+    return _repeat_to_n(
+        _reservoir_sample(config.path, mtime, config.k_unique_scenes),
+        num_scenes,
+    )
+
+
+_DISPATCH = {
+    SelectionDiscipline.FIRST_N: _first_n,
+    SelectionDiscipline.RANDOM_N: _random_n,
+    SelectionDiscipline.PAD_N: _pad_n,
+    SelectionDiscipline.EXACT_N: _exact_n,
+    SelectionDiscipline.K_UNIQUE_N: _k_unique_n,
+}
+
+
+def select_scenes(config):
+    assert _is_non_empty_dir(
+        config.path
+    ), "The data directory does not exist or is empty."
+
+    # Let a running prefetch fill the cache rather than listing the directory
+    # twice. A prefetch that has not started yet is cancelled and the
+    # directory is listed directly. A future inherited through fork is
+    # ignored, since the thread that would complete it does not exist in
+    # this process. Errors are left for the regular listing below to surface.
+    listing_future = getattr(config, "_listing_future", None)
+    if (
+        listing_future is not None
+        and getattr(config, "_listing_pid", None) == os.getpid()
+        and not listing_future.cancel()
+    ):
+        wait([listing_future])
+
+    num_scenes = config.num_scenes
+    mtime = os.stat(config.path).st_mtime_ns
+    selected_scenes = _DISPATCH[config.discipline](config, mtime, num_scenes)
 
-    if not any(scene.startswith("tfrecord") for scene in selected_scenes):
+    if not selected_scenes:
         raise ValueError(
             "The selected scenes do not contain traffic scenes. Something went wrong with the scene selection."
         )
 
+    # Scene names are plain file names, so a separator join is enough
+    abs_path = os.path.abspath(config.path)
     scene_paths = [
-        os.path.join(os.path.abspath(config.path), selected_scene)
+        f"{abs_path}{os.sep}{selected_scene}"
         for selected_scene in selected_scenes
     ] 
     
-    print(f'\n--- Ratio unique scenes / number of worls = {len(np.unique(scene_paths))} / {len(scene_paths)} ---\n')
+    if getattr(config, "verbose", False):
+        print(f'\n--- Ratio unique scenes / number of worls = {len(set(scene_paths))} / {len(scene_paths)} ---\n')
         
     return scene_paths
@@ -0,0 +1,148 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from pygpudrive.env.config import SceneConfig, SelectionDiscipline
+from pygpudrive.env.scene_selector import select_scenes
+
+NUM_TFRECORDS = 10
+NON_SCENE_FILE = "README.txt"
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for i in range(NUM_TFRECORDS):
+        (tmp_path / f"tfrecord-{i:05d}-of-01000_{i}.json").write_text("{}")
+    (tmp_path / NON_SCENE_FILE).write_text("not a scene")
+    return tmp_path
+
+
+def random_n_config(path, num_scenes):
+    return SceneConfig(
+        path=str(path),
+        num_scenes=num_scenes,
+        discipline=SelectionDiscipline.RANDOM_N,
+        verbose=False,
+    )
+
+
+def test_random_n_returns_distinct_scenes(data_dir):
+    scene_paths = select_scenes(random_n_config(data_dir, 4))
+
+    assert len(scene_paths) == 4
+    assert len(set(scene_paths)) == 4
+    for scene_path in scene_paths:
+        assert os.path.isabs(scene_path)
+        assert os.path.basename(scene_path).startswith("tfrecord")
+
+
+def test_random_n_is_reproducible(data_dir):
+    first = select_scenes(random_n_config(data_dir, 4))
+    second = select_scenes(random_n_config(data_dir, 4))
+
+    assert first == second
+
+
+def test_random_n_more_scenes_than_available(data_dir):
+    with pytest.raises(ValueError):
+        select_scenes(random_n_config(data_dir, NUM_TFRECORDS + 1))
+
+
+@pytest.mark.parametrize("discipline", list(SelectionDiscipline))
+def test_non_scene_files_are_never_selected(data_dir, discipline):
+    config = SceneConfig(
+        path=str(data_dir),
+        num_scenes=NUM_TFRECORDS,
+        discipline=discipline,
+        k_unique_scenes=3,
+        verbose=False,
+    )
+    scene_paths = select_scenes(config)
+
+    assert len(scene_paths) == NUM_TFRECORDS
+    assert all(
+        os.path.basename(scene_path) != NON_SCENE_FILE
+        for scene_path in scene_paths
+    )
+
+
+@pytest.mark.parametrize("discipline", list(SelectionDiscipline))
+def test_directory_without_scenes(tmp_path, discipline):
+    (tmp_path / NON_SCENE_FILE).write_text("not a scene")
+    config = SceneConfig(
+        path=str(tmp_path),
+        num_scenes=1,
+        discipline=discipline,
+        k_unique_scenes=1,
+        verbose=False,
+    )
+
+    with pytest.raises(ValueError, match="does not contain any traffic scenes"):
+        select_scenes(config)
+
+
+def first_n_config(path, num_scenes):
+    return SceneConfig(
+        path=str(path),
+        num_scenes=num_scenes,
+        discipline=SelectionDiscipline.FIRST_N,
+        verbose=False,
+    )
+
+
+def test_pending_prefetch_is_cancelled(data_dir):
+    config = first_n_config(data_dir, 2)
+    # A prefetch that never started is cancelled instead of waited on
+    config._listing_future = Future()
+
+    scene_paths = select_scenes(config)
+
+    assert len(scene_paths) == 2
+    assert config._listing_future.cancelled()
+
+
+def test_running_prefetch_is_waited_on(data_dir):
+    config = first_n_config(data_dir, 2)
+    future = Future()
+    future.set_running_or_notify_cancel()
+    config._listing_future = future
+    timer = threading.Timer(0.1, future.set_result, args=(None,))
+    timer.start()
+
+    scene_paths = select_scenes(config)
+    timer.join()
+
+    assert len(scene_paths) == 2
+    assert future.done() and not future.cancelled()
+
+
+def _select_scenes_in_child(config):
+    select_scenes(config)
+
+
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(),
+    reason="requires the fork start method",
+)
+def test_forked_child_ignores_inherited_prefetch(data_dir):
+    config = first_n_config(data_dir, 2)
+    # A running prefetch that never completes, as seen by a child forked
+    # while the parent's prefetch thread is still listing
+    future = Future()
+    future.set_running_or_notify_cancel()
+    config._listing_future = future
+
+    child = multiprocessing.get_context("fork").Process(
+        target=_select_scenes_in_child, args=(config,)
+    )
+    child.start()
+    child.join(timeout=10)
+    if child.is_alive():
+        child.kill()
+        child.join()
+        pytest.fail("select_scenes blocked on a prefetch inherited through fork")
+
+    assert child.exitcode == 0